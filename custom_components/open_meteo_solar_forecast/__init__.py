@@ -6,9 +6,9 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DATA_CLOUD_COVER_CACHE, DOMAIN
 from .exceptions import OpenMeteoSolarForecastUpdateFailed  # noqa: F401
-from .coordinator import OpenMeteoSolarForecastDataUpdateCoordinator
+from .coordinator import CloudCoverCache, OpenMeteoSolarForecastDataUpdateCoordinator
 
 PLATFORMS = [Platform.SENSOR]
 
@@ -36,6 +36,18 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the shared cloud cover cache along with the last config entry."""
+    if any(
+        other_entry.entry_id != entry.entry_id
+        for other_entry in hass.config_entries.async_entries(DOMAIN)
+    ):
+        return
+
+    cloud_cache = hass.data.pop(DATA_CLOUD_COVER_CACHE, None) or CloudCoverCache(hass)
+    await cloud_cache.async_remove()
+
+
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Update options."""
     await hass.config_entries.async_reload(entry.entry_id)
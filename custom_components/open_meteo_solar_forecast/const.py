@@ -7,6 +7,8 @@ import logging
 DOMAIN = "open_meteo_solar_forecast"
 LOGGER = logging.getLogger(__package__)
 
+DATA_CLOUD_COVER_CACHE = f"{DOMAIN}_cloud_cover_cache"
+
 CONF_BASE_URL = "base_url"
 CONF_DECLINATION = "declination"
 CONF_AZIMUTH = "azimuth"
@@ -1,11 +1,24 @@
 """DataUpdateCoordinator for the Open-Meteo Solar Forecast integration."""
 from __future__ import annotations
-from datetime import timedelta, datetime, timezone
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import date, timedelta, datetime, timezone
+from itertools import dropwhile, islice
+from typing import Any
+from urllib.parse import urlencode
+from aiohttp import ClientError, ClientTimeout
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_API_KEY, CONF_LATITUDE, CONF_LONGITUDE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 from open_meteo_solar_forecast import Estimate, OpenMeteoSolarForecast
 
 from .const import (
@@ -20,19 +33,121 @@ from .const import (
     CONF_MODEL,
     CONF_CLOUD_MODEL,
     CONF_CLOUD_CORRECTION_FACTOR,
+    DATA_CLOUD_COVER_CACHE,
     DEFAULT_CLOUD_CORRECTION_FACTOR,
     DOMAIN,
     LOGGER,
 )
 from .exceptions import OpenMeteoSolarForecastUpdateFailed
 
-def clean_value(value):
-    """Remove brackets and convert to float, then return as string."""
+# Cloud cover always comes from the free public API, whatever host and API
+# key the estimate is configured with
+CLOUD_COVER_URL = "https://api.open-meteo.com/v1/forecast"
+
+# Keep a stalled cloud cover request from holding up the coordinator update
+CLOUD_COVER_TIMEOUT = ClientTimeout(total=30)
+
+# Retry transient cloud cover failures with full jitter backoff so that
+# installations do not all retry Open-Meteo in lockstep after an outage
+CLOUD_COVER_ATTEMPTS = 3
+CLOUD_COVER_BACKOFF = 0.5
+CLOUD_COVER_BACKOFF_MAX = 10.0
+CLOUD_COVER_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Open-Meteo refreshes cloud cover at most hourly. Responses are shared between
+# config entries at the same location and survive entry reloads and restarts;
+# the TTL stays below the update interval so regular updates still fetch fresh data.
+CLOUD_COVER_CACHE_TTL = timedelta(minutes=15).total_seconds()
+CLOUD_COVER_STORAGE_KEY = f"{DOMAIN}.cloud_cover"
+CLOUD_COVER_STORAGE_VERSION = 1
+CLOUD_COVER_SAVE_DELAY = 10
+
+ADJUSTMENT_SAMPLE_SIZE = 5
+
+
+class CloudCoverCache:
+    """Cloud cover responses shared by all config entries and persisted to storage."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cloud cover cache."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, CLOUD_COVER_STORAGE_VERSION, CLOUD_COVER_STORAGE_KEY
+        )
+        self._responses: dict[str, dict[str, Any]] | None = None
+        self._load_lock = asyncio.Lock()
+        # One lock per request key, only identical requests wait on each other
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def async_get_or_fetch(
+        self, key: str, fetch: Callable[[], Awaitable[dict]]
+    ) -> dict:
+        """Return the cached response for key, fetching it if missing or expired."""
+        if self._responses is None:
+            async with self._load_lock:
+                if self._responses is None:
+                    self._responses = await self._store.async_load() or {}
+
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            cached = self._responses.get(key)
+            if cached is not None and time.time() - cached["fetched"] < CLOUD_COVER_CACHE_TTL:
+                LOGGER.debug("Using cached cloud cover data for %s", key)
+                return cached["data"]
+
+            data = await fetch()
+            self._async_set(key, data)
+            return data
+
+    @callback
+    def async_discard(self, key: str) -> None:
+        """Drop the cached response for key, so the next update fetches it again."""
+        if self._responses and self._responses.pop(key, None) is not None:
+            self._store.async_delay_save(lambda: self._responses, CLOUD_COVER_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted responses, cancelling any pending save."""
+        self._responses = None
+        await self._store.async_remove()
+
+    @callback
+    def _async_set(self, key: str, data: dict) -> None:
+        """Store a fresh response, dropping expired ones, and schedule a save."""
+        now = time.time()
+        self._responses = {
+            cached_key: cached
+            for cached_key, cached in self._responses.items()
+            if now - cached["fetched"] < CLOUD_COVER_CACHE_TTL
+        }
+        self._responses[key] = {"fetched": now, "data": data}
+        self._store.async_delay_save(lambda: self._responses, CLOUD_COVER_SAVE_DELAY)
+
+
+@dataclass(slots=True)
+class CoordinatorExtras:
+    """Results of the last cloud cover adjustment, empty when none ran."""
+
+    adjustment_stats: dict[str, float] = field(default_factory=dict)
+    # Hours from the current one on (iso, watts before, watts after, wh before, wh after)
+    adjustment_sample: list[tuple[str, float | None, float | None, float, float]] = field(
+        default_factory=list
+    )
+    # Cloud cover and adjustment factor of the first 24 hours, already formatted
+    hourly_cloud_cover: dict[str, dict[str, str]] = field(default_factory=dict)
+
+
+def bucket_by_date(series: dict[datetime, Any], since: date) -> dict[date, dict[str, Any]]:
+    """Split a timestamped series into one isoformat keyed dict per local date from since on."""
+    buckets: dict[date, dict[str, Any]] = {}
+    isoformat = datetime.isoformat
+    for timestamp, value in series.items():
+        if (timestamp_date := timestamp.date()) >= since:
+            buckets.setdefault(timestamp_date, {})[isoformat(timestamp)] = value
+    return buckets
+
+def clean_value(value) -> float:
+    """Remove brackets and convert to a float rounded to 2 decimals."""
     if isinstance(value, str):
         value = value.strip('[]')
-    cleaned_value = round(float(value), 2)
-    LOGGER.debug("Cleaned value: %s", cleaned_value)
-    return str(cleaned_value)
+    return round(float(value), 2)
 
 class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate]):
     """The Solar Forecast Data Update Coordinator."""
@@ -41,7 +156,6 @@ class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the Solar Forecast coordinator."""
         self.config_entry = entry
-        self.daily_forecasts = {}  # Dictionnaire pour stocker les prévisions journalières
 
         # Our option flow may cause it to be an empty string,
         # this if statement is here to catch that.
@@ -54,14 +168,14 @@ class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate
         # Ensure latitude and longitude are valid numbers
         latitude = clean_value(entry.data[CONF_LATITUDE])
         longitude = clean_value(entry.data[CONF_LONGITUDE])
-        if not (-90 <= float(latitude) <= 90) or not (-180 <= float(longitude) <= 180):
+        if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
             raise ValueError("Invalid latitude or longitude values")
 
         self.forecast = OpenMeteoSolarForecast(
             api_key=api_key,
             session=async_get_clientsession(hass),
-            latitude=float(latitude),
-            longitude=float(longitude),
+            latitude=latitude,
+            longitude=longitude,
             azimuth=entry.options[CONF_AZIMUTH] - 180,
             base_url=entry.options[CONF_BASE_URL],
             ac_kwp=ac_kwp,
@@ -73,10 +187,36 @@ class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate
             weather_model=entry.options.get(CONF_MODEL, "best_match"),
         )
 
+        # The cloud cover request only depends on the config entry, and an
+        # options change reloads the entry, so build it once here, with the
+        # coordinates formatted the same way as the estimate.
+        # Seven days of hourly values, with unix timestamps to align them.
+        self._cloud_url = CLOUD_COVER_URL
+        self._cloud_params = {
+            "latitude": str(latitude),
+            "longitude": str(longitude),
+            "hourly": "cloud_cover",
+            "timeformat": "unixtime",
+            "timezone": "auto",
+            "models": entry.options.get(CONF_CLOUD_MODEL, "best_match"),
+            "forecast_days": "7",
+        }
+        self._cloud_cache_key = f"{self._cloud_url}?" + urlencode(
+            sorted(self._cloud_params.items())
+        )
+        if (cloud_cache := hass.data.get(DATA_CLOUD_COVER_CACHE)) is None:
+            cloud_cache = hass.data[DATA_CLOUD_COVER_CACHE] = CloudCoverCache(hass)
+        self._cloud_cache: CloudCoverCache = cloud_cache
+
         # Initialiser les attributs pour le débogage
-        self.cloud_cover_data = []
-        self.original_values = {}
-        self.adjustment_stats = {}
+        self.extras = CoordinatorExtras()
+
+        # Series split per date and keyed by isoformat, rebuilt on every update
+        # and shared as is by the attributes of the daily sensors
+        self.watts_by_date: dict[date, dict[str, Any]] = {}
+        self.wh_period_by_date: dict[date, dict[str, Any]] = {}
+        # Bumped on every successful update, lets the sensors cache their attributes
+        self.data_version = 0
 
         update_interval = timedelta(minutes=30)
 
@@ -85,14 +225,42 @@ class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate
     async def _async_update_data(self) -> Estimate:
         """Fetch Open-Meteo Solar Forecast estimates."""
         try:
-            estimate = await self.forecast.estimate()
-            
-            cloud_cover_data = await self._fetch_hourly_cloud_cover()
-            self._adjust_estimate_with_cloud_cover(estimate, cloud_cover_data)
-            
-            for day in estimate.wh_days:
-                date_str = day.isoformat()
-                self.daily_forecasts[date_str] = estimate.wh_days[day]
+            # Both requests are independent, run them concurrently
+            estimate, cloud_cover_data = await asyncio.gather(
+                self.forecast.estimate(),
+                self._fetch_hourly_cloud_cover(),
+                return_exceptions=True,
+            )
+            if isinstance(estimate, BaseException):
+                raise estimate
+
+            # A cloud cover failure should not discard the solar estimate
+            if isinstance(cloud_cover_data, BaseException):
+                LOGGER.warning(
+                    "Error fetching cloud cover data, using unadjusted estimate: %s",
+                    cloud_cover_data,
+                )
+                # Do not publish the results of a previous adjustment
+                self.extras = CoordinatorExtras()
+            else:
+                try:
+                    self._adjust_estimate_with_cloud_cover(estimate, cloud_cover_data)
+                except Exception as err:  # noqa: BLE001
+                    # The factors are computed before the estimate is modified
+                    LOGGER.warning(
+                        "Error adjusting estimate with cloud cover data, using unadjusted estimate: %s",
+                        err,
+                    )
+                    self.extras = CoordinatorExtras()
+                    # Do not serve the same unusable response until the TTL expires
+                    self._cloud_cache.async_discard(self._cloud_cache_key)
+
+            # The sensors only expose the days from today on
+            today = estimate.now().date()
+            self.watts_by_date = bucket_by_date(estimate.watts, today)
+            self.wh_period_by_date = bucket_by_date(estimate.wh_period, today)
+            self.data_version += 1
+
             return estimate
         except Exception as error:
             LOGGER.error("Error fetching data: %s", error)
@@ -100,41 +268,62 @@ class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate
 
     async def _fetch_hourly_cloud_cover(self) -> list:
         """Fetch hourly cloud cover data from open-meteo.com."""
-        
-        latitude = clean_value(str(self.forecast.latitude))
-        longitude = clean_value(str(self.forecast.longitude))
-        cloud_cover_model=self.config_entry.options.get(CONF_CLOUD_MODEL,"best_match")
-        LOGGER.debug("Fetching cloud cover data for latitude: %s, longitude: %s", latitude, longitude)
-        
-        # Obtenir des prévisions sur 7 jours avec un pas de temps horaire
-        # Inclure les timestamps pour pouvoir aligner les données
-        url = f"https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&hourly=cloud_cover&timeformat=iso8601&timezone=auto&models={cloud_cover_model}&forecast_days=7"
-        LOGGER.debug("Fetching cloud cover data from URL: %s", url)
-        
-        async with self.forecast.session.get(url) as response:
-            if response.status != 200:
-                response_text = await response.text()
-                LOGGER.error("Failed to fetch cloud cover data: %s. Response: %s", response.status, response_text)
-                raise Exception(f"Failed to fetch cloud cover data: {response.status}")
-            
-            data = await response.json()
-            
-            # Stocker la réponse complète pour référence
-            self.last_cloud_api_response = data
-            
-            cloud_cover_data = data.get("hourly", {}).get("cloud_cover", [])
-            
-            
-            return cloud_cover_data
+        data = await self._cloud_cache.async_get_or_fetch(
+            self._cloud_cache_key, self._request_hourly_cloud_cover
+        )
+
+        # Stocker la réponse complète pour référence
+        self.last_cloud_api_response = data
+
+        return data.get("hourly", {}).get("cloud_cover", [])
+
+    async def _request_hourly_cloud_cover(self) -> dict:
+        """Request hourly cloud cover data from open-meteo.com."""
+        LOGGER.debug("Fetching cloud cover data from URL: %s", self._cloud_url)
+
+        session = self.forecast.session
+        error: Exception | str | None = None
+        for attempt in range(1, CLOUD_COVER_ATTEMPTS + 1):
+            try:
+                async with session.get(
+                    self._cloud_url, params=self._cloud_params, timeout=CLOUD_COVER_TIMEOUT
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json(loads=json_loads)
+                        # Only cache a response the adjustment can read
+                        hourly = data.get("hourly") if isinstance(data, dict) else None
+                        if not isinstance(hourly, dict) or not isinstance(hourly.get("cloud_cover"), list):
+                            raise OpenMeteoSolarForecastUpdateFailed("Invalid cloud cover response: no hourly cloud_cover")
+                        return data
+
+                    response_text = await response.text()
+                    if response.status not in CLOUD_COVER_RETRY_STATUSES or attempt == CLOUD_COVER_ATTEMPTS:
+                        LOGGER.error("Failed to fetch cloud cover data: %s. Response: %s", response.status, response_text)
+                        raise Exception(f"Failed to fetch cloud cover data: {response.status}")
+                    error = f"HTTP {response.status}"
+            except (ClientError, asyncio.TimeoutError) as err:
+                if attempt == CLOUD_COVER_ATTEMPTS:
+                    raise
+                error = err
+
+            delay = random.uniform(0, min(CLOUD_COVER_BACKOFF_MAX, CLOUD_COVER_BACKOFF * 2**attempt))
+            LOGGER.debug("Cloud cover request failed (%s), retrying in %.1f s", error, delay)
+            await asyncio.sleep(delay)
+
+        # The last attempt returns or raises, never fall through with None
+        raise OpenMeteoSolarForecastUpdateFailed(
+            f"Failed to fetch cloud cover data: {error}"
+        ) from (error if isinstance(error, Exception) else None)
 
     def _adjust_estimate_with_cloud_cover(self, estimate: Estimate, cloud_cover_data: list) -> None:
         """Ajuster l'estimation solaire en fonction des données de nébulosité."""
         if not cloud_cover_data:
             LOGGER.warning("No cloud cover data available for adjustment")
+            self.extras = CoordinatorExtras()
             return
         
-        # Stocker les données de nébulosité pour y accéder depuis le capteur de débogage
-        self.cloud_cover_data = cloud_cover_data
+        # Résultats de l'ajustement exposés aux capteurs et aux diagnostics
+        extras = self.extras
         
         # Récupérer la liste des timestamps des données de nébulosité depuis l'API
         cloud_timestamps = []
@@ -144,194 +333,173 @@ class OpenMeteoSolarForecastDataUpdateCoordinator(DataUpdateCoordinator[Estimate
         except (AttributeError, KeyError):
             LOGGER.warning("No cloud timestamp data available, using sequential hours")
         
-        # Sauvegarder les valeurs originales avant ajustement pour comparaison
-        self.original_values = {
-            "watts": {str(k): v for k, v in estimate.watts.items()},
-            "wh_period": {str(k): v for k, v in estimate.wh_period.items()},
-            "wh_days": {str(k): v for k, v in estimate.wh_days.items()},
-            "power_production_now": estimate.power_production_now,
-            "energy_production_today": estimate.energy_production_today,
-            "energy_production_tomorrow": estimate.energy_production_tomorrow
-        }
+        # Sauvegarder avant ajustement les seules valeurs originales lues
+        # ensuite, celles de l'échantillon, plutôt qu'une copie des séries.
+        # L'échantillon suit les heures pleines de wh_period à partir de l'heure
+        # courante: les premières entrées de la série datent des jours passés,
+        # hors de la fenêtre couverte par la nébulosité
+        current_hour = estimate.now().replace(minute=0, second=0, microsecond=0)
+        original_sample = [
+            (timestamp, estimate.watts.get(timestamp), wh)
+            for timestamp, wh in islice(
+                dropwhile(lambda item: item[0] < current_hour, estimate.wh_period.items()),
+                ADJUSTMENT_SAMPLE_SIZE,
+            )
+        ]
         
         # Somme totale avant ajustement pour calculer le pourcentage
         total_energy_before = sum(estimate.wh_period.values())
         
-        # Convertir les timestamps cloud en dictionnaire pour faciliter la recherche
+        # Indexer la nébulosité par heure exacte (datetimes UTC aware, comparables
+        # directement aux timestamps de l'estimation quel que soit leur fuseau).
+        # Open-Meteo renvoie null au-delà de l'horizon du modèle: ces heures
+        # restent sans ajustement
         cloud_cover_dict = {}
-        if cloud_timestamps:
-            for i, timestamp_str in enumerate(cloud_timestamps):
-                if i < len(cloud_cover_data):
-                    # Convertir le format "2024-04-06T12:00" en datetime
-                    try:
-                        # Supprimer le 'T' et ajouter les secondes si nécessaire
-                        dt_str = timestamp_str.replace('T', ' ')
-                        if len(dt_str.split(':')) == 2:
-                            dt_str += ':00'  # Ajouter les secondes si non présentes
-                        cloud_dt = datetime.fromisoformat(dt_str)
-                        cloud_cover_dict[cloud_dt] = cloud_cover_data[i]
-                        # LOGGER.debug("Cloud timestamp mapping: %s -> %s%%", dt_str, cloud_cover_data[i])
-                    except ValueError as e:
-                        LOGGER.error("Error parsing timestamp %s: %s", timestamp_str, e)
-        
-        # Créer un journal de débogage pour les ajustements
-        adjustment_log = {}
-        
-        # Ajuster les watts (puissance instantanée)
-        for timestamp, watts in list(estimate.watts.items()):
-            # Chercher la valeur de nébulosité pour ce timestamp spécifique
-            cloud_cover_percent = 0
-            
-            if cloud_cover_dict:
-                # Essayer de trouver le timestamp le plus proche
-                closest_timestamp = None
-                min_difference = timedelta(hours=24)  # Initialiser à une grande valeur
-                
-                # Convertir timestamp local en UTC si nécessaire pour la comparaison
-                utc_timestamp = timestamp
-                if timestamp.tzinfo:  # Si timestamp a une timezone
-                    utc_timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
-                
-                for cloud_dt in cloud_cover_dict:
-                    # Calculer la différence en ignorant les secondes/microsecondes
-                    dt1 = utc_timestamp.replace(second=0, microsecond=0)
-                    dt2 = cloud_dt.replace(second=0, microsecond=0)
-                    difference = abs(dt1 - dt2)
-                    
-                    if difference < min_difference:
-                        min_difference = difference
-                        closest_timestamp = cloud_dt
-                
-                # Si on a trouvé un timestamp proche (moins de 2 heures de différence)
-                if closest_timestamp and min_difference <= timedelta(hours=2):
-                    cloud_cover_percent = cloud_cover_dict[closest_timestamp]
-                    # LOGGER.debug(
-                    #     "Matched timestamp %s with cloud data timestamp %s (diff: %s), cloud cover: %s%%",
-                    #     timestamp, closest_timestamp, min_difference, cloud_cover_percent
-                    # )
-                else:
-                    # Fallback à l'ancienne méthode basée sur l'heure du jour
-                    day_offset = (timestamp.date() - estimate.now().date()).days
-                    hour_index = timestamp.hour + (day_offset * 24)
-                    
-                    if 0 <= hour_index < len(cloud_cover_data):
-                        cloud_cover_percent = cloud_cover_data[hour_index]
-                        # LOGGER.debug(
-                        #     "Using fallback hour index method for %s: day_offset=%s, hour=%s, index=%s, cloud cover: %s%%", 
-                        #     timestamp, day_offset, timestamp.hour, hour_index, cloud_cover_percent
-                        # )
-            else:
-                # Fallback à l'ancienne méthode basée sur l'heure du jour comme dernier recours
-                day_offset = (timestamp.date() - estimate.now().date()).days
-                hour_index = timestamp.hour + (day_offset * 24)
-                
-                if 0 <= hour_index < len(cloud_cover_data):
-                    cloud_cover_percent = cloud_cover_data[hour_index]
-            
+        for timestamp, cloud_cover_percent in zip(cloud_timestamps, cloud_cover_data):
+            if cloud_cover_percent is None:
+                continue
+            try:
+                cloud_dt = datetime.fromtimestamp(timestamp, timezone.utc)
+            except (TypeError, ValueError, OverflowError) as e:
+                LOGGER.error("Error parsing timestamp %s: %s", timestamp, e)
+                continue
+            cloud_cover_dict[cloud_dt] = cloud_cover_percent
 
-            # Facteur d'ajustement: 100% de nébulosité = réduction de 70% (ajustable selon vos besoins)
+        today = estimate.now().date()
 
-            cloud_correction_factor = self.config_entry.options.get(CONF_CLOUD_CORRECTION_FACTOR, DEFAULT_CLOUD_CORRECTION_FACTOR)
-            adjustment_factor = 1.0 - (cloud_cover_percent / 100.0 * cloud_correction_factor)
-            adjusted_watts = watts * adjustment_factor
-                 
-            # Appliquer l'ajustement
-            estimate.watts[timestamp] = adjusted_watts
-        
-        # Utiliser la même logique pour ajuster wh_period
-        for timestamp, wh in list(estimate.wh_period.items()):
-            # Même méthode d'alignement que pour watts
-            cloud_cover_percent = 0
-            
-            # [Répéter la même logique d'alignement que ci-dessus]
-            if cloud_cover_dict:
-                # Trouver le timestamp le plus proche...
-                # [code similaire à ci-dessus]
-                pass
-            else:
-                # Fallback
-                day_offset = (timestamp.date() - estimate.now().date()).days
-                hour_index = timestamp.hour + (day_offset * 24)
-                
-                if 0 <= hour_index < len(cloud_cover_data):
-                    cloud_cover_percent = cloud_cover_data[hour_index]
-            
-            adjustment_factor = 1.0 - (cloud_cover_percent / 100.0 * 0.7)
-            estimate.wh_period[timestamp] = wh * adjustment_factor
-            
-            # Ajouter au compteur de totaux pour les statistiques
-            date_str = timestamp.date().isoformat()
-            if date_str in adjustment_log:
-                adjustment_log[date_str]["original_total"] += wh
-                adjustment_log[date_str]["adjusted_total"] += (wh * adjustment_factor)
-        
-        # Pour wh_days, calculer une moyenne journalière de nébulosité
-        date_cloud_cover = {}  # Stocke la couverture nuageuse moyenne par jour
-        
-        # Si nous avons des timestamps, calculer la moyenne par jour correctement
-        if cloud_timestamps:
-            for i, timestamp_str in enumerate(cloud_timestamps):
-                if i < len(cloud_cover_data):
-                    try:
-                        dt_str = timestamp_str.replace('T', ' ')
-                        cloud_dt = datetime.fromisoformat(dt_str)
-                        date_str = cloud_dt.date().isoformat()
-                        
-                        if date_str not in date_cloud_cover:
-                            date_cloud_cover[date_str] = {
-                                "total": cloud_cover_data[i],
-                                "count": 1
-                            }
-                        else:
-                            date_cloud_cover[date_str]["total"] += cloud_cover_data[i]
-                            date_cloud_cover[date_str]["count"] += 1
-                    except ValueError:
-                        pass
+        # Facteur d'ajustement: 100% de nébulosité = réduction de 70% par défaut (ajustable dans les options)
+        cloud_correction_factor = self.config_entry.options.get(CONF_CLOUD_CORRECTION_FACTOR, DEFAULT_CLOUD_CORRECTION_FACTOR)
+
+        def adjustment(cloud_cover_percent: float | None) -> float:
+            if cloud_cover_percent is None:
+                return 1.0
+            return 1.0 - (cloud_cover_percent / 100.0 * cloud_correction_factor)
+
+        def known(cloud_cover_slice: list) -> list:
+            """Valeurs de nébulosité disponibles d'une tranche."""
+            return [cloud_cover_percent for cloud_cover_percent in cloud_cover_slice if cloud_cover_percent is not None]
+
+        # Tout ce qui dépend des données de nébulosité est calculé avant de
+        # modifier l'estimation, qui reste intacte si ces données sont invalides
+
+        # Précalculer une seule fois le facteur d'ajustement de chaque heure
+        adjustment_by_hour = {
+            cloud_dt: adjustment(cloud_cover_percent)
+            for cloud_dt, cloud_cover_percent in cloud_cover_dict.items()
+        }
+        adjustments = [adjustment(cloud_cover_percent) for cloud_cover_percent in cloud_cover_data]
+        hourly_cloud_cover = {
+            f"{hour:02d}:00": {
+                "cloud_cover": f"{int(cloud_cover_percent)}%",
+                "adjustment_factor": f"{adjustment_factor:.2f}",
+            }
+            for hour, (cloud_cover_percent, adjustment_factor) in enumerate(
+                zip(cloud_cover_data[:24], adjustments)
+            )
+            if cloud_cover_percent is not None
+        }
+
+        def adjustment_by_hour_index(timestamp: datetime) -> float:
+            """Fallback à l'ancienne méthode basée sur l'heure du jour."""
+            hour_index = timestamp.hour + (timestamp.date() - today).days * 24
+            return adjustments[hour_index] if 0 <= hour_index < len(adjustments) else 1.0
+
+        # Pour wh_days, calculer une fois la moyenne journalière de nébulosité
+        date_cloud_cover = {}  # Stocke la couverture nuageuse totale et le nombre d'heures par jour
+
+        # Si nous avons des timestamps, regrouper les valeurs déjà analysées par jour local
+        if cloud_cover_dict:
+            # Fuseau IANA de la réponse, pour suivre les changements d'heure de
+            # la semaine; décalage fixe seulement si le fuseau est inconnu
+            response = self.last_cloud_api_response
+            cloud_timezone = (
+                (timezone_name := response.get("timezone"))
+                and dt_util.get_time_zone(timezone_name)
+            ) or timezone(timedelta(seconds=response.get("utc_offset_seconds", 0)))
+            for cloud_dt, cloud_cover_percent in cloud_cover_dict.items():
+                totals = date_cloud_cover.setdefault(cloud_dt.astimezone(cloud_timezone).date(), [0, 0])
+                totals[0] += cloud_cover_percent
+                totals[1] += 1
         # Sinon, faire une estimation plus basique
         else:
             # Diviser les données de cloud_cover_data en tranches de 24h
             for i in range(0, len(cloud_cover_data), 24):
-                day_slice = cloud_cover_data[i:i+24]
-                if day_slice:
-                    day_idx = i // 24
-                    today = estimate.now().date()
-                    date = today + timedelta(days=day_idx)
-                    date_cloud_cover[date.isoformat()] = {
-                        "total": sum(day_slice),
-                        "count": len(day_slice)
-                    }
-        
-        # Ajuster wh_days avec la nébulosité moyenne par jour
-        for day, wh in list(estimate.wh_days.items()):
-            date_str = day.isoformat()
-            if date_str in date_cloud_cover and date_cloud_cover[date_str]["count"] > 0:
-                avg_cloud_cover = date_cloud_cover[date_str]["total"] / date_cloud_cover[date_str]["count"]
+                if day_slice := known(cloud_cover_data[i:i+24]):
+                    date_cloud_cover[today + timedelta(days=i // 24)] = [sum(day_slice), len(day_slice)]
+
+        daily_avg_cloud_cover = {
+            cloud_date: total / count for cloud_date, (total, count) in date_cloud_cover.items()
+        }
+
+        first_day_cloud_cover = known(cloud_cover_data[:24])
+        average_cloud_cover = (
+            sum(first_day_cloud_cover) / len(first_day_cloud_cover) if first_day_cloud_cover else 0
+        )
+
+        # Ajuster les watts (puissance instantanée) avec l'heure pleine la plus proche
+        half_hour = timedelta(minutes=30)
+        watts = estimate.watts
+        for timestamp, value in watts.items():
+            if adjustment_by_hour:
+                hour = (timestamp + half_hour).replace(minute=0, second=0, microsecond=0)
+                adjustment_factor = adjustment_by_hour.get(hour, 1.0)
+            else:
+                adjustment_factor = adjustment_by_hour_index(timestamp)
+
+            watts[timestamp] = value * adjustment_factor
+
+        # Utiliser la même logique pour ajuster wh_period (les clés sont des heures pleines)
+        wh_period = estimate.wh_period
+        for timestamp, wh in wh_period.items():
+            if adjustment_by_hour:
+                adjustment_factor = adjustment_by_hour.get(timestamp, 1.0)
             else:
+                adjustment_factor = adjustment_by_hour_index(timestamp)
+
+            wh_period[timestamp] = wh * adjustment_factor
+
+        # Ajuster wh_days avec la nébulosité moyenne par jour
+        debug_enabled = LOGGER.isEnabledFor(logging.DEBUG)
+        wh_days = estimate.wh_days
+        for day, wh in wh_days.items():
+            avg_cloud_cover = daily_avg_cloud_cover.get(day)
+            if avg_cloud_cover is None:
                 # Fallback
-                day_offset = (day - estimate.now().date()).days
-                start_idx = day_offset * 24
-                end_idx = start_idx + 24
-                day_slice = cloud_cover_data[start_idx:end_idx] if 0 <= start_idx < len(cloud_cover_data) else []
+                start_idx = (day - today).days * 24
+                day_slice = known(cloud_cover_data[start_idx:start_idx + 24]) if 0 <= start_idx < len(cloud_cover_data) else []
                 avg_cloud_cover = sum(day_slice) / len(day_slice) if day_slice else 0
-                
-            adjustment_factor = 1.0 - (avg_cloud_cover / 100.0 * 0.7)
-            estimate.wh_days[day] = wh * adjustment_factor
+
+            adjustment_factor = adjustment(avg_cloud_cover)
+            wh_days[day] = wh * adjustment_factor
             
             # Enregistrer pour le débogage ( A garder)
-            LOGGER.debug(
-                "Day adjustment - %s: avg cloud cover: %.1f%%, original: %.1f, adjusted: %.1f", 
-                date_str, avg_cloud_cover, wh, (wh * adjustment_factor)
-            )
+            if debug_enabled:
+                LOGGER.debug(
+                    "Day adjustment - %s: avg cloud cover: %.1f%%, original: %.1f, adjusted: %.1f",
+                    day, avg_cloud_cover, wh, (wh * adjustment_factor)
+                )
         
         # Calculer les statistiques d'ajustement
         total_energy_after = sum(estimate.wh_period.values())
         adjustment_pct = ((total_energy_after - total_energy_before) / total_energy_before * 100) if total_energy_before else 0
         
-        # Stocker les statistiques et le log d'ajustement
-        self.adjustment_stats = {
-            "average_cloud_cover": sum(cloud_cover_data[:24])/min(24, len(cloud_cover_data)) if cloud_cover_data else 0,
+        # Stocker les statistiques d'ajustement
+        extras.hourly_cloud_cover = hourly_cloud_cover
+        extras.adjustment_stats = {
+            "average_cloud_cover": average_cloud_cover,
             "total_energy_before_adjustment": total_energy_before,
             "total_energy_after_adjustment": total_energy_after,
             "adjustment_percentage": adjustment_pct,
-            "daily_adjustments": adjustment_log
         }
+
+        # Échantillon calculé une fois ici plutôt qu'à chaque lecture
+        extras.adjustment_sample = [
+            (
+                timestamp.isoformat(),
+                original_watt,
+                watts.get(timestamp),
+                original_wh,
+                wh_period[timestamp],
+            )
+            for timestamp, original_watt, original_wh in original_sample
+        ]
@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
 from typing import Any
 
 from homeassistant.components.sensor import (
@@ -18,34 +19,122 @@ from homeassistant.components.sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy, UnitOfPower
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_utc_time_change
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from open_meteo_solar_forecast.models import Estimate
 
 from .const import ATTR_WATTS, ATTR_WH_PERIOD, DOMAIN
 from .coordinator import OpenMeteoSolarForecastDataUpdateCoordinator
 
+SIGNAL_MINUTE_TICK = f"{DOMAIN}_minute_tick_{{}}"
 
+_EMPTY_ATTRS: Mapping[str, Any] = MappingProxyType({})
 
+THIRTY_SECONDS = timedelta(seconds=30)
+ONE_MINUTE = timedelta(minutes=1)
+FIFTEEN_MINUTES = timedelta(minutes=15)
+THIRTY_MINUTES = timedelta(minutes=30)
+ONE_HOUR = timedelta(hours=1)
+TWELVE_HOURS = timedelta(hours=12)
+ONE_DAY = timedelta(days=1)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, kw_only=True)
 class OpenMeteoSolarForecastSensorEntityDescription(SensorEntityDescription):
     """Describes a Forecast.Solar Sensor."""
 
-    state: Callable[[Estimate], Any] | None = None
+    state: Callable[[Estimate, datetime], Any]
+    # Days from today of the watts / wh_period attributes, None for no attributes
+    day_offset: int | None = None
+    # Value changes within a day, other sensors only follow the date
+    time_varying: bool = False
+
+
+def _energy_production_today(estimate: Estimate, now: datetime) -> int:
+    return estimate.day_production(now.date())
+
+
+def _energy_production_today_remaining(estimate: Estimate, now: datetime) -> int:
+    return estimate.energy_production_today_remaining
+
+
+def _energy_production_tomorrow(estimate: Estimate, now: datetime) -> int:
+    return estimate.day_production(now.date() + ONE_DAY)
+
+
+def _power_highest_peak_time_today(estimate: Estimate, now: datetime) -> datetime:
+    return estimate.peak_production_time(now.date())
+
+
+def _power_highest_peak_time_tomorrow(estimate: Estimate, now: datetime) -> datetime:
+    return estimate.peak_production_time(now.date() + ONE_DAY)
+
+
+def _power_production_now(estimate: Estimate, now: datetime) -> int:
+    return estimate.power_production_at_time(now)
+
+
+def _power_production_next_15minutes(estimate: Estimate, now: datetime) -> int:
+    return estimate.power_production_at_time(now + FIFTEEN_MINUTES)
+
+
+def _power_production_next_30minutes(estimate: Estimate, now: datetime) -> int:
+    return estimate.power_production_at_time(now + THIRTY_MINUTES)
+
+
+def _power_production_next_hour(estimate: Estimate, now: datetime) -> int:
+    return estimate.power_production_at_time(now + ONE_HOUR)
+
+
+def _power_production_next_12hours(estimate: Estimate, now: datetime) -> int:
+    return estimate.power_production_at_time(now + TWELVE_HOURS)
+
+
+def _power_production_next_24hours(estimate: Estimate, now: datetime) -> int:
+    return estimate.power_production_at_time(now + ONE_DAY)
+
+
+def _energy_current_hour(estimate: Estimate, now: datetime) -> int:
+    return estimate.energy_current_hour
+
+
+def _energy_next_hour(estimate: Estimate, now: datetime) -> int:
+    return estimate.sum_energy_production(1)
+
+
+def _daily_energy_description(
+    days: int,
+) -> OpenMeteoSolarForecastSensorEntityDescription:
+    """Describe the energy production sensor for today + days."""
+    delta = timedelta(days=days)
+    return OpenMeteoSolarForecastSensorEntityDescription(
+        key=f"energy_production_d{days}",
+        translation_key=f"energy_production_d{days}",
+        state=lambda estimate, now: estimate.day_production(now.date() + delta),
+        day_offset=days,
+        device_class=SensorDeviceClass.ENERGY,
+        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
+        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+        suggested_display_precision=1,
+    )
 
 
 SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="energy_production_today",
         translation_key="energy_production_today",
-        state=lambda estimate: estimate.energy_production_today,
+        state=_energy_production_today,
+        day_offset=0,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
@@ -54,7 +143,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="energy_production_today_remaining",
         translation_key="energy_production_today_remaining",
-        state=lambda estimate: estimate.energy_production_today_remaining,
+        state=_energy_production_today_remaining,
+        time_varying=True,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
@@ -63,102 +153,40 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="energy_production_tomorrow",
         translation_key="energy_production_tomorrow",
-        state=lambda estimate: estimate.energy_production_tomorrow,
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        suggested_display_precision=1,
-    ),
-    OpenMeteoSolarForecastSensorEntityDescription(
-        key="energy_production_d2",
-        translation_key="energy_production_d2",
-        state=lambda estimate: estimate.day_production(
-            estimate.now().date() + timedelta(days=2)
-        ),
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        suggested_display_precision=1,
-    ),
-    OpenMeteoSolarForecastSensorEntityDescription(
-        key="energy_production_d3",
-        translation_key="energy_production_d3",
-        state=lambda estimate: estimate.day_production(
-            estimate.now().date() + timedelta(days=3)
-        ),
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        suggested_display_precision=1,
-    ),
-    OpenMeteoSolarForecastSensorEntityDescription(
-        key="energy_production_d4",
-        translation_key="energy_production_d4",
-        state=lambda estimate: estimate.day_production(
-            estimate.now().date() + timedelta(days=4)
-        ),
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        suggested_display_precision=1,
-    ),
-    OpenMeteoSolarForecastSensorEntityDescription(
-        key="energy_production_d5",
-        translation_key="energy_production_d5",
-        state=lambda estimate: estimate.day_production(
-            estimate.now().date() + timedelta(days=5)
-        ),
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        suggested_display_precision=1,
-    ),
-    OpenMeteoSolarForecastSensorEntityDescription(
-        key="energy_production_d6",
-        translation_key="energy_production_d6",
-        state=lambda estimate: estimate.day_production(
-            estimate.now().date() + timedelta(days=6)
-        ),
-        device_class=SensorDeviceClass.ENERGY,
-        native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
-        suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
-        suggested_display_precision=1,
-    ),
-    OpenMeteoSolarForecastSensorEntityDescription(
-        key="energy_production_d7",
-        translation_key="energy_production_d7",
-        state=lambda estimate: estimate.day_production(
-            estimate.now().date() + timedelta(days=7)
-        ),
+        state=_energy_production_tomorrow,
+        day_offset=1,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
         suggested_display_precision=1,
     ),
+    *(_daily_energy_description(days) for days in range(2, 8)),
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_highest_peak_time_today",
         translation_key="power_highest_peak_time_today",
+        state=_power_highest_peak_time_today,
         device_class=SensorDeviceClass.TIMESTAMP,
     ),
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_highest_peak_time_tomorrow",
         translation_key="power_highest_peak_time_tomorrow",
+        state=_power_highest_peak_time_tomorrow,
         device_class=SensorDeviceClass.TIMESTAMP,
     ),
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_production_now",
         translation_key="power_production_now",
         device_class=SensorDeviceClass.POWER,
-        state=lambda estimate: estimate.power_production_now,
+        state=_power_production_now,
+        time_varying=True,
         state_class=SensorStateClass.MEASUREMENT,
         native_unit_of_measurement=UnitOfPower.WATT,
     ),
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_production_next_15minutes",
         translation_key="power_production_next_15minutes",
-        state=lambda estimate: estimate.power_production_at_time(
-            estimate.now() + timedelta(minutes=15)
-        ),
+        state=_power_production_next_15minutes,
+        time_varying=True,
         device_class=SensorDeviceClass.POWER,
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfPower.WATT,
@@ -166,9 +194,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_production_next_30minutes",
         translation_key="power_production_next_30minutes",
-        state=lambda estimate: estimate.power_production_at_time(
-            estimate.now() + timedelta(minutes=30)
-        ),
+        state=_power_production_next_30minutes,
+        time_varying=True,
         device_class=SensorDeviceClass.POWER,
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfPower.WATT,
@@ -176,9 +203,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_production_next_hour",
         translation_key="power_production_next_hour",
-        state=lambda estimate: estimate.power_production_at_time(
-            estimate.now() + timedelta(hours=1)
-        ),
+        state=_power_production_next_hour,
+        time_varying=True,
         device_class=SensorDeviceClass.POWER,
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfPower.WATT,
@@ -186,9 +212,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_production_next_12hours",
         translation_key="power_production_next_12hours",
-        state=lambda estimate: estimate.power_production_at_time(
-            estimate.now() + timedelta(hours=12)
-        ),
+        state=_power_production_next_12hours,
+        time_varying=True,
         device_class=SensorDeviceClass.POWER,
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfPower.WATT,
@@ -196,9 +221,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="power_production_next_24hours",
         translation_key="power_production_next_24hours",
-        state=lambda estimate: estimate.power_production_at_time(
-            estimate.now() + timedelta(hours=24)
-        ),
+        state=_power_production_next_24hours,
+        time_varying=True,
         device_class=SensorDeviceClass.POWER,
         entity_registry_enabled_default=False,
         native_unit_of_measurement=UnitOfPower.WATT,
@@ -206,7 +230,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="energy_current_hour",
         translation_key="energy_current_hour",
-        state=lambda estimate: estimate.energy_current_hour,
+        state=_energy_current_hour,
+        time_varying=True,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
@@ -215,7 +240,8 @@ SENSORS: tuple[OpenMeteoSolarForecastSensorEntityDescription, ...] = (
     OpenMeteoSolarForecastSensorEntityDescription(
         key="energy_next_hour",
         translation_key="energy_next_hour",
-        state=lambda estimate: estimate.sum_energy_production(1),
+        state=_energy_next_hour,
+        time_varying=True,
         device_class=SensorDeviceClass.ENERGY,
         native_unit_of_measurement=UnitOfEnergy.WATT_HOUR,
         suggested_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
@@ -230,24 +256,77 @@ async def async_setup_entry(
     coordinator: OpenMeteoSolarForecastDataUpdateCoordinator = hass.data[DOMAIN][
         entry.entry_id
     ]
-    entities = []
-    
+    # One DeviceInfo shared by all the sensors of the entry
+    device_info = DeviceInfo(
+        entry_type=DeviceEntryType.SERVICE,
+        identifiers={(DOMAIN, entry.entry_id)},
+        manufacturer="Open-Meteo",
+        name="Solar production forecast",
+        configuration_url="https://open-meteo.com",
+    )
     # Ajouter tous les capteurs standard
-    for entity_description in SENSORS:
-        entities.append(
-            OpenMeteoSolarForecastSensorEntity(
-                entry_id=entry.entry_id,
-                coordinator=coordinator,
-                entity_description=entity_description,
-            )
+    async_add_entities(
+        OpenMeteoSolarForecastSensorEntity(
+            entry_id=entry.entry_id,
+            coordinator=coordinator,
+            entity_description=entity_description,
+            device_info=device_info,
         )
-        
-    async_add_entities(entities)
+        for entity_description in SENSORS
+    )
+
+    cancel_tick: CALLBACK_TYPE | None = None
+
+    @callback
+    def _async_minute_tick(now: datetime) -> None:
+        """Let the sensors of this entry refresh their time dependent state."""
+        nonlocal cancel_tick
+        # The timer may fire a hair early or late, tick for the minute it was
+        # armed for and arm the next one from that boundary
+        minute = (now + THIRTY_SECONDS).replace(second=0, microsecond=0)
+        # Converted once here and shared by every sensor of the entry
+        async_dispatcher_send(
+            hass,
+            SIGNAL_MINUTE_TICK.format(entry.entry_id),
+            minute.astimezone(coordinator.data.timezone),
+        )
+        cancel_tick = async_call_later(
+            hass, _seconds_until(minute + ONE_MINUTE, now), _async_minute_tick
+        )
+
+    @callback
+    def _async_cancel_tick() -> None:
+        if cancel_tick is not None:
+            cancel_tick()
+
+    # A single timer per config entry instead of one per sensor, re-armed
+    # for the next minute instead of matching a time pattern on every fire
+    now = dt_util.utcnow()
+    cancel_tick = async_call_later(
+        hass,
+        _seconds_until(now.replace(second=0, microsecond=0) + ONE_MINUTE, now),
+        _async_minute_tick,
+    )
+    entry.async_on_unload(_async_cancel_tick)
+
+
+def _seconds_until(target: datetime, now: datetime) -> float:
+    """Return the delay from now until target, never negative."""
+    return max((target - now).total_seconds(), 0)
 
 class OpenMeteoSolarForecastSensorEntity(
     CoordinatorEntity[OpenMeteoSolarForecastDataUpdateCoordinator], SensorEntity
 ):
     """Defines a Open-Meteo sensor."""
+    # Only the attributes added here, the Home Assistant bases keep a __dict__
+    __slots__ = (
+        "_attrs",
+        "_attrs_key",
+        "_cloud_adjustment_attrs",
+        "_entry_id",
+        "_last_available",
+        "_now",
+    )
     entity_description: OpenMeteoSolarForecastSensorEntityDescription
     _attr_has_entity_name = True
     def __init__(
@@ -256,94 +335,109 @@ class OpenMeteoSolarForecastSensorEntity(
         entry_id: str,
         coordinator: OpenMeteoSolarForecastDataUpdateCoordinator,
         entity_description: OpenMeteoSolarForecastSensorEntityDescription,
+        device_info: DeviceInfo,
     ) -> None:
         """Initialize Open-Meteo Solar sensor."""
         super().__init__(coordinator=coordinator)
         self.entity_description = entity_description
         self.entity_id = f"{SENSOR_DOMAIN}.{entity_description.key}"
         self._attr_unique_id = f"{entry_id}_{entity_description.key}"
-        self._attr_device_info = DeviceInfo(
-            entry_type=DeviceEntryType.SERVICE,
-            identifiers={(DOMAIN, entry_id)},
-            manufacturer="Open-Meteo",
-            name="Solar production forecast",
-            configuration_url="https://open-meteo.com",
-        )
-    async def _update_callback(self, now: datetime) -> None:
+        self._entry_id = entry_id
+        self._attrs_key: tuple[int, date | None] | None = None
+        self._attrs: Mapping[str, Any] | None = None
+        self._last_available = coordinator.last_update_success
+        # Resolved once, only the energy sensors carry the cloud adjustment
+        self._cloud_adjustment_attrs = entity_description.key.startswith("energy_")
+        self._async_update_native_value(coordinator.data.now())
+        self._attr_device_info = device_info
+    @callback
+    def _async_update_native_value(self, now: datetime) -> bool:
+        """Compute the state at now, return whether it changed."""
+        # Kept for extra_state_attributes, written right after
+        self._now = now
+        data = self.coordinator.data
+        native_value: StateType | datetime = self.entity_description.state(data, now)
+        if native_value == self._attr_native_value:
+            return False
+        self._attr_native_value = native_value
+        return True
+    @callback
+    def _async_minute_tick(self, now: datetime) -> None:
         """Update the entity without fetching data from server.
         This is required for the power_production_* sensors to update
         as they take data in 15-minute intervals and the update interval
-        is 30 minutes."""
-        self.async_write_ha_state()
+        is 30 minutes. The state is only written when it changed."""
+        if (
+            not self.entity_description.time_varying
+            and now.date() == self._now.date()
+        ):
+            return
+        previous_attrs = self._attrs
+        value_changed = self._async_update_native_value(now)
+        # On a new day the attributes follow the target date even when the
+        # value does not change; they are rebuilt, so compared by identity
+        if value_changed or self.extra_state_attributes is not previous_attrs:
+            self.async_write_ha_state()
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        previous_attrs = self._attrs
+        value_changed = self._async_update_native_value(self.coordinator.data.now())
+        available = self.available
+        # A refresh returning the same forecast does not need a new state
+        if (
+            not value_changed
+            and available == self._last_available
+            and self.extra_state_attributes == previous_attrs
+        ):
+            return
+        self._last_available = available
+        super()._handle_coordinator_update()
     async def async_added_to_hass(self) -> None:
         """Register callbacks."""
         await super().async_added_to_hass()
         # Update the state of the sensor every minute without
         # fetching new data from the server.
-        async_track_utc_time_change(
-            self.hass,
-            self._update_callback,
-            second=0,
-        )
-    @property
-    def native_value(self) -> datetime | StateType:
-        """Return the state of the sensor."""
-        if self.entity_description.state is None:
-            state: StateType | datetime = getattr(
-                self.coordinator.data, self.entity_description.key
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_MINUTE_TICK.format(self._entry_id),
+                self._async_minute_tick,
             )
-        else:
-            state = self.entity_description.state(self.coordinator.data)
-        return state
+        )
     @property
-    def extra_state_attributes(self) -> dict[str, Any] | None:
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
         """Return the state attributes."""
-        attrs = None
+        day_offset = self.entity_description.day_offset
+        target_date = (
+            None if day_offset is None else self._now.date() + timedelta(days=day_offset)
+        )
+        # Same data and same day, the attributes cannot have changed
+        attrs_key = (self.coordinator.data_version, target_date)
+        if attrs_key != self._attrs_key:
+            self._attrs_key = attrs_key
+            attrs = self._build_extra_state_attributes(target_date)
+            # Read-only view, the cached dict is handed out on every write;
+            # sensors without attributes all share the same empty one
+            self._attrs = MappingProxyType(attrs) if attrs else _EMPTY_ATTRS
+        return self._attrs
+    def _build_extra_state_attributes(self, target_date: date | None) -> dict[str, Any]:
+        """Build the state attributes for target_date."""
+        attrs: dict[str, Any] = {}
+        coordinator = self.coordinator
         
-        if self.entity_description.key.startswith(
-            "energy_production_d"
-        ) or self.entity_description.key in (
-            "energy_production_today",
-            "energy_production_tomorrow",
-        ):
-            target_date = self.coordinator.data.now().date()
-            if self.entity_description.key == "energy_production_tomorrow":
-                target_date += timedelta(days=1)
-            elif self.entity_description.key.startswith("energy_production_d"):
-                target_date += timedelta(
-                    days=int(self.entity_description.key[len("energy_production_d") :])
-                )
-            elif self.entity_description.key == "energy_production_today":
-                pass  # target_date is already set to today
-            else:
-                raise ValueError(
-                    f"Unexpected key {self.entity_description.key} for extra_state_attributes"
-                )
-            attrs = {
-                ATTR_WATTS: {
-                    watt_datetime.isoformat(): watt_value
-                    for watt_datetime, watt_value in self.coordinator.data.watts.items()
-                    if watt_datetime.date() == target_date
-                },
-                ATTR_WH_PERIOD: {
-                    wh_datetime.isoformat(): wh_value
-                    for wh_datetime, wh_value in self.coordinator.data.wh_period.items()
-                    if wh_datetime.date() == target_date
-                },
-            }
-        else:
-            attrs = {}
+        if target_date is not None:
+            # Dicts prepared once per refresh by the coordinator, shared as is
+            attrs[ATTR_WATTS] = coordinator.watts_by_date.get(target_date, {})
+            attrs[ATTR_WH_PERIOD] = coordinator.wh_period_by_date.get(target_date, {})
             
         # Ajouter les informations d'ajustement de nébulosité seulement pour les capteurs d'énergie
-        if hasattr(self.coordinator, "adjustment_stats") and self.entity_description.key.startswith("energy_"):
+        adjustment_stats = coordinator.extras.adjustment_stats
+        if adjustment_stats and self._cloud_adjustment_attrs:
             cloud_info = {
-                "average_cloud_cover": f"{self.coordinator.adjustment_stats.get('average_cloud_cover', 0):.1f}%",
-                "adjustment": f"{self.coordinator.adjustment_stats.get('adjustment_percentage', 0):.1f}%"
+                "average_cloud_cover": f"{adjustment_stats['average_cloud_cover']:.1f}%",
+                "adjustment": f"{adjustment_stats['adjustment_percentage']:.1f}%"
             }
-            
-            if not attrs:
-                attrs = {}
-                
             attrs["cloud_adjustment"] = cloud_info
             
         return attrs